@@ -0,0 +1,230 @@
+# sa_001/parallel_analysis.py
+"""Parallel group-by aggregations via hash-partitioned sharding.
+
+ParallelGroupby forks one process pool per DataFrame. The workers inherit
+the frame copy-on-write, so it is never pickled, along with a shared
+row-order buffer they all write into. An aggregation runs in two phases on that
+same pool:
+
+1. Partition: the rows are split into contiguous shards, one per worker.
+   Each worker hashes the group key of its own rows only. It then writes
+   their positions into the shared buffer, grouped by hash partition and
+   kept in row order within each partition, and returns the partition sizes.
+2. Aggregate: worker p gathers the rows of partition p from every shard.
+   Every row of a group lands on the same worker, in its original order.
+   The worker runs the same pandas group-by as the serial functions on
+   those rows, so each group's values are added in the same order and the
+   results are identical.
+
+Only the partition sizes and each worker's final, disjoint groups cross
+process boundaries. The parent concatenates and sorts them. The pool
+relies on the "fork" start method, so it needs a POSIX system and must be
+created from a single-threaded process.
+"""
+import mmap
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from sa_001.sales_analysis import (
+    revenue_by_product,
+    revenue_by_region,
+    average_discount_by_category,
+)
+
+
+# The frame and row-order buffer bound to this worker process, installed at fork.
+_FRAME: Optional[pd.DataFrame] = None
+_ORDER: Optional[np.ndarray] = None
+
+
+def _install(df: pd.DataFrame, order: np.ndarray) -> None:
+    """Pool initializer: remember the inherited frame and buffer in the worker."""
+    global _FRAME, _ORDER
+    _FRAME = df
+    _ORDER = order
+
+
+def _partition_shard(start: int, stop: int, key: str, partitions: int) -> np.ndarray:
+    """Write the positions of rows [start, stop) into _ORDER, grouped by key hash.
+
+    Runs in a worker process. Returns the number of rows in each partition.
+    """
+    keys = _FRAME[key].iloc[start:stop]
+    if isinstance(keys.dtype, pd.CategoricalDtype):
+        # Codes identify categories consistently across shards and are cheap to use
+        hashes = keys.cat.codes.to_numpy().astype(np.uint64)
+    else:
+        hashes = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+    # A stable sort on small integers keeps row order within each partition
+    bucket = (hashes % np.uint64(partitions)).astype(np.uint16)
+    _ORDER[start:stop] = start + np.argsort(bucket, kind="stable")
+    return np.bincount(bucket, minlength=partitions)
+
+
+def _aggregate_partition(
+    ranges: List[Tuple[int, int]], key: str, value: str, how: str
+) -> pd.Series:
+    """Aggregate the rows of one hash partition, given its slices of _ORDER.
+
+    Runs in a worker process.
+    """
+    positions = np.concatenate([_ORDER[begin:end] for begin, end in ranges])
+
+    def column(name: str) -> np.ndarray:
+        # Taking from the raw array avoids building an index for the gathered rows
+        return _FRAME[name].to_numpy().take(positions)
+
+    # The key keeps its dtype (e.g. categorical) so the result index matches
+    keys = pd.Series(_FRAME[key].array.take(positions))
+    if value == "revenue":
+        values = column("quantity") * column("unit_price") * (1 - column("discount"))
+    else:
+        values = column(value)
+    grouped = pd.Series(values).groupby(keys, observed=True)
+    return grouped.mean() if how == "mean" else grouped.sum()
+
+
+class ParallelGroupby:
+    """Process pool bound to one DataFrame, for repeated parallel aggregations.
+
+    Workers snapshot the frame when the pool starts, so later changes to df
+    are not visible. Use one instance for several aggregations on the same
+    frame, then close() it.
+    """
+
+    def __init__(self, df: pd.DataFrame, workers: Optional[int] = None) -> None:
+        if workers is not None and workers < 1:
+            raise ValueError("workers must be at least 1")
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise RuntimeError("ParallelGroupby requires the 'fork' start method (POSIX only)")
+        if threading.active_count() > 1:
+            raise RuntimeError(
+                "ParallelGroupby must be created from a single-threaded process; "
+                "forking while other threads run can deadlock"
+            )
+        self.workers = workers or os.cpu_count() or 1
+        edges = np.linspace(0, len(df), self.workers + 1).astype(int)
+        self.shards: List[Tuple[int, int]] = list(zip(edges[:-1], edges[1:]))
+        self.lock = threading.Lock()
+
+        # Anonymous shared mapping: forked workers write into the same pages
+        self.buffer = mmap.mmap(-1, max(len(df), 1) * 8)
+        order = np.frombuffer(self.buffer, dtype=np.int64, count=len(df))
+        # With "fork", initargs are inherited rather than pickled
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_install,
+            initargs=(df, order),
+        )
+        # Fork the workers now so they all see the frame as it is today
+        self.executor.submit(os.getpid).result()
+
+    def revenue_by_product(self) -> pd.Series:
+        """Parallel equivalent of revenue_by_product."""
+        return self._aggregate("product", "revenue", "sum")
+
+    def revenue_by_region(self) -> pd.Series:
+        """Parallel equivalent of revenue_by_region."""
+        return self._aggregate("region", "revenue", "sum")
+
+    def average_discount_by_category(self) -> pd.Series:
+        """Parallel equivalent of average_discount_by_category."""
+        return self._aggregate("category", "discount", "mean")
+
+    def close(self) -> None:
+        """Shut down the worker pool."""
+        self.executor.shutdown(wait=True)
+
+    def __enter__(self) -> "ParallelGroupby":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _aggregate(self, key: str, value: str, how: str) -> pd.Series:
+        """Partition rows by key hash, aggregate each partition, combine the results."""
+        partitions = self.workers
+        # The row-order buffer is shared by every aggregation on this pool
+        with self.lock:
+            sized = [
+                self.executor.submit(_partition_shard, start, stop, key, partitions)
+                for start, stop in self.shards
+            ]
+            sizes = [future.result() for future in sized]
+
+            # Slice of the buffer holding partition p's rows from each shard
+            offsets = [
+                start + np.concatenate([[0], np.cumsum(size)])
+                for (start, _), size in zip(self.shards, sizes)
+            ]
+            aggregated = [
+                self.executor.submit(
+                    _aggregate_partition,
+                    [(int(offset[p]), int(offset[p + 1])) for offset in offsets],
+                    key, value, how,
+                )
+                for p in range(partitions)
+            ]
+            results = [future.result() for future in aggregated]
+
+        # Drop empty partitions so they cannot change the concatenated dtype
+        non_empty = [result for result in results if len(result)] or results[:1]
+        return pd.concat(non_empty).sort_index().rename(value).rename_axis(key)
+
+
+def synthetic_sales_data(rows: int, products: int = 100_000, seed: int = 0) -> pd.DataFrame:
+    """Generate a random sales DataFrame with the sample CSV's columns."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "region": pd.Categorical.from_codes(rng.integers(0, 4, rows), ["East", "North", "South", "West"]),
+        "product": rng.integers(0, products, rows),
+        "category": pd.Categorical.from_codes(rng.integers(0, 3, rows), ["Electronics", "Furniture", "Office"]),
+        "quantity": rng.integers(1, 20, rows),
+        "unit_price": rng.uniform(5.0, 1000.0, rows).round(2),
+        "discount": rng.choice([0.0, 0.05, 0.1, 0.15, 0.2], rows),
+    })
+
+
+def run_benchmark(rows: int = 50_000_000, workers: Optional[int] = None) -> None:
+    """Time serial against parallel aggregations on synthetic data."""
+    df = synthetic_sales_data(rows)
+    start = time.perf_counter()
+    pool = ParallelGroupby(df, workers=workers)
+    startup_time = time.perf_counter() - start
+
+    pairs = [
+        (revenue_by_product, pool.revenue_by_product),
+        (revenue_by_region, pool.revenue_by_region),
+        (average_discount_by_category, pool.average_discount_by_category),
+    ]
+    print(f"Rows: {rows:,}  Workers: {pool.workers}  Pool startup: {startup_time:.2f}s")
+    with pool:
+        for serial, parallel in pairs:
+            start = time.perf_counter()
+            expected = serial(df)
+            serial_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            actual = parallel()
+            parallel_time = time.perf_counter() - start
+
+            pd.testing.assert_series_equal(actual, expected, check_exact=True)
+            print(
+                f"  {serial.__name__:30s} serial {serial_time:6.2f}s  "
+                f"parallel {parallel_time:6.2f}s  speedup {serial_time / parallel_time:5.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    run_benchmark(rows, workers)
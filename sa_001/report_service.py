@@ -0,0 +1,306 @@
+# sa_001/report_service.py
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from threading import Condition, Lock
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+import pandas as pd
+
+from sa_001.sales_analysis import (
+    DEFAULT_CHUNKSIZE,
+    load_sales_data,
+    iter_sales_chunks,
+    total_revenue,
+    revenue_by_region,
+    revenue_by_product,
+    monthly_revenue,
+    top_n_products_by_revenue,
+    average_discount_by_category,
+    approximate_top_n_products_by_revenue,
+    approximate_distinct_count,
+    approximate_revenue_quantiles_by_region,
+)
+
+
+# Metrics the service knows how to compute, by request name.
+METRICS: Dict[str, Callable[..., Any]] = {
+    "total_revenue": total_revenue,
+    "revenue_by_region": revenue_by_region,
+    "revenue_by_product": revenue_by_product,
+    "monthly_revenue": monthly_revenue,
+    "top_n_products_by_revenue": top_n_products_by_revenue,
+    "average_discount_by_category": average_discount_by_category,
+    "approximate_top_n_products_by_revenue": approximate_top_n_products_by_revenue,
+    "approximate_distinct_count": approximate_distinct_count,
+    "approximate_revenue_quantiles_by_region": approximate_revenue_quantiles_by_region,
+}
+
+# Sketch-based metrics, fed CSV chunks rather than the fully loaded frame
+# so their memory stays bounded.
+STREAMED_METRICS = frozenset({
+    "approximate_top_n_products_by_revenue",
+    "approximate_distinct_count",
+    "approximate_revenue_quantiles_by_region",
+})
+
+# Exact metrics only, as served by the demo.
+EXACT_METRICS = [name for name in METRICS if name not in STREAMED_METRICS]
+
+# Marker distinguishing a cache miss from a legitimately cached None.
+_MISSING = object()
+
+
+def file_identity(csv_path: Path) -> Tuple[str, int, int]:
+    """Return (resolved path, mtime in ns, size) identifying a file's current contents."""
+    path = Path(csv_path).resolve()
+    stat = path.stat()
+    return str(path), stat.st_mtime_ns, stat.st_size
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after a fixed TTL."""
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        ttl: Optional[float] = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if absent or expired."""
+        with self.lock:
+            value = self._lookup(key)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Like get(), but without updating the hit/miss counters."""
+        with self.lock:
+            value = self._lookup(key)
+            return default if value is _MISSING else value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the least recently used entry if full."""
+        with self.lock:
+            self.entries[key] = (self.clock(), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self.entries)
+
+    def _lookup(self, key: Hashable) -> Any:
+        """Return the live value for key or _MISSING; caller holds the lock."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return _MISSING
+        stored_at, value = entry
+        if self.ttl is not None and self.clock() - stored_at >= self.ttl:
+            # Expired: drop it so it no longer counts towards capacity
+            del self.entries[key]
+            return _MISSING
+        self.entries.move_to_end(key)
+        return value
+
+
+class _Call:
+    """An in-flight computation that concurrent callers can wait on."""
+
+    def __init__(self) -> None:
+        self.condition = Condition()
+        self.done = False
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into a single execution."""
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run fn for key, or wait for and share the result of an identical in-flight call.
+
+        Exceptions raised by fn are re-raised in every caller waiting on it.
+        """
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self.calls[key] = call
+
+        if not leader:
+            with call.condition:
+                while not call.done:
+                    call.condition.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            # Unregister before waking waiters so later callers start a fresh call
+            with self.lock:
+                del self.calls[key]
+            with call.condition:
+                call.done = True
+                call.condition.notify_all()
+        return call.result
+
+
+class SalesReportService:
+    """Serves sales metrics with caching, request coalescing and a worker pool.
+
+    Loaded frames and computed metrics are cached by file identity
+    (path, mtime, size), so editing the CSV invalidates its entries. Cached
+    results are shared between callers and must not be mutated.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        ttl: Optional[float] = 300.0,
+        max_workers: int = 4,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.frames = TTLCache(max_entries=max_entries, ttl=ttl, clock=clock)
+        self.results = TTLCache(max_entries=max_entries, ttl=ttl, clock=clock)
+        self.flight = SingleFlight()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def load(self, csv_path: Path) -> pd.DataFrame:
+        """Return the sales DataFrame for csv_path, loading it at most once per version."""
+        key = file_identity(csv_path)
+        return self._cached(self.frames, ("load",) + key, lambda: load_sales_data(csv_path))
+
+    def report(self, csv_path: Path, metric: str, **params: Any) -> Any:
+        """Compute a single metric (e.g. 'top_n_products_by_revenue', n=3) for csv_path.
+
+        List parameters, as decoded from JSON, are converted to tuples so they
+        can form part of the cache key. top_n_products_by_revenue with
+        approximate=True is served by the streamed approximate metric.
+        """
+        if metric not in METRICS:
+            raise KeyError(f"Unknown metric: {metric!r}")
+        params = {
+            name: tuple(value) if isinstance(value, list) else value
+            for name, value in params.items()
+        }
+        if metric == "top_n_products_by_revenue" and params.pop("approximate", False):
+            metric = "approximate_top_n_products_by_revenue"
+        key = ("report", metric, tuple(sorted(params.items()))) + file_identity(csv_path)
+
+        def compute() -> Any:
+            if metric in STREAMED_METRICS:
+                chunks = iter_sales_chunks(csv_path, params.get("chunksize", DEFAULT_CHUNKSIZE))
+                return METRICS[metric](chunks, **params)
+            return METRICS[metric](self.load(csv_path), **params)
+
+        return self._cached(self.results, key, compute)
+
+    def reports(
+        self, csv_path: Path, metrics: Iterable[str]
+    ) -> Dict[str, Any]:
+        """Compute several independent metrics concurrently on the worker pool."""
+        futures = {
+            metric: self.executor.submit(self.report, csv_path, metric)
+            for metric in metrics
+        }
+        return {metric: future.result() for metric, future in futures.items()}
+
+    def clear(self) -> None:
+        """Drop all cached frames and results."""
+        self.frames.clear()
+        self.results.clear()
+
+    def close(self) -> None:
+        """Shut down the worker pool."""
+        self.executor.shutdown(wait=True)
+
+    def __enter__(self) -> "SalesReportService":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _cached(self, cache: TTLCache, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return cache[key], computing it under single-flight on a miss."""
+        value = cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        def compute_and_store() -> Any:
+            # Re-check: a previous flight may have filled the cache meanwhile
+            value = cache.peek(key, _MISSING)
+            if value is _MISSING:
+                value = compute()
+                cache.put(key, value)
+            return value
+
+        return self.flight.do(key, compute_and_store)
+
+
+class ReportClient:
+    """In-process client for SalesReportService, mirroring the reporting endpoint.
+
+    Requests are plain dicts ({"path": ..., "metric": ..., "params": {...}})
+    and responses are {"status": "ok", "result": ...} or
+    {"status": "error", "error": ...}, so callers can be exercised offline.
+    """
+
+    def __init__(self, service: SalesReportService) -> None:
+        self.service = service
+
+    def request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle a single report request."""
+        try:
+            result = self.service.report(
+                Path(payload["path"]), payload["metric"], **payload.get("params", {})
+            )
+        except (KeyError, OSError, TypeError, ValueError) as exc:
+            return {"status": "error", "error": f"{type(exc).__name__}: {exc}"}
+        return {"status": "ok", "result": result}
+
+
+def run_demo() -> None:
+    """Serve every metric for the sample data twice to show cache hits."""
+    data_path = Path(__file__).parent / "data" / "sales_sample.csv"
+    with SalesReportService() as service:
+        for _ in range(2):
+            results = service.reports(data_path, EXACT_METRICS)
+        print(f"Total Revenue: ${results['total_revenue']:,.2f}")
+        print(f"Metrics served: {len(results)}")
+        print(f"Result cache hits: {service.results.hits}")
+
+
+if __name__ == "__main__":
+    run_demo()
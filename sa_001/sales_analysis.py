@@ -1,13 +1,33 @@
 # sa_001/sales_analysis.py
 from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence, Union
 import pandas as pd
 
+from sa_001.sketches import HeavyHitters, HyperLogLog, QuantileSketch
+
+# Either a whole DataFrame or a stream of DataFrame chunks.
+SalesData = Union[pd.DataFrame, Iterable[pd.DataFrame]]
+
+# Rows per chunk fed to the approximate functions' sketches.
+DEFAULT_CHUNKSIZE = 100_000
+
 
 def load_sales_data(csv_path: Path) -> pd.DataFrame:
     """Load sales data from CSV into a DataFrame."""
     return pd.read_csv(csv_path, parse_dates=["date"])
 
 
+def iter_sales_chunks(
+    csv_path: Path, chunksize: int = DEFAULT_CHUNKSIZE
+) -> Iterator[pd.DataFrame]:
+    """Stream sales data from CSV as DataFrames of at most chunksize rows.
+    
+    The file is closed once the stream is exhausted or the generator is closed.
+    """
+    with pd.read_csv(csv_path, parse_dates=["date"], chunksize=chunksize) as reader:
+        yield from reader
+
+
 def add_revenue_column(df: pd.DataFrame) -> pd.DataFrame:
     """Return a copy of df with a new 'revenue' column.
     
@@ -46,8 +66,16 @@ def monthly_revenue(df: pd.DataFrame) -> pd.Series:
     )
 
 
-def top_n_products_by_revenue(df: pd.DataFrame, n: int = 5) -> pd.Series:
-    """Return top N products by revenue in descending order."""
+def top_n_products_by_revenue(
+    df: pd.DataFrame, n: int = 5, approximate: bool = False
+) -> pd.Series:
+    """Return top N products by revenue in descending order.
+    
+    With approximate=True, uses approximate_top_n_products_by_revenue, which
+    groups bounded row chunks instead of every product at once.
+    """
+    if approximate:
+        return approximate_top_n_products_by_revenue(df, n=n)
     return revenue_by_product(df).sort_values(ascending=False).head(n)
 
 
@@ -56,6 +84,70 @@ def average_discount_by_category(df: pd.DataFrame) -> pd.Series:
     return df.groupby("category")["discount"].mean()
 
 
+def _as_chunks(data: SalesData, chunksize: int) -> Iterable[pd.DataFrame]:
+    """Slice a DataFrame into row chunks; pass an existing stream through.
+    
+    Bounding the rows per chunk bounds each chunk's group-by, whatever the
+    total number of distinct keys.
+    """
+    if not isinstance(data, pd.DataFrame):
+        return data
+    return (data.iloc[start:start + chunksize] for start in range(0, len(data), chunksize))
+
+
+def approximate_top_n_products_by_revenue(
+    data: SalesData, n: int = 5, capacity: int = 1000, chunksize: int = DEFAULT_CHUNKSIZE
+) -> pd.Series:
+    """Approximate top N products by revenue in bounded memory.
+    
+    Tracks at most `capacity` products with a HeavyHitters summary. Reported
+    revenues are lower bounds, each short by at most total revenue / (capacity + 1).
+    """
+    sketch = HeavyHitters(capacity=capacity)
+    for chunk in _as_chunks(data, chunksize):
+        chunk = add_revenue_column(chunk)
+        sketch.update(chunk["product"], chunk["revenue"])
+    return sketch.top(n).rename("revenue").rename_axis("product")
+
+
+def approximate_distinct_count(
+    data: SalesData, column: str, precision: int = 14, chunksize: int = DEFAULT_CHUNKSIZE
+) -> float:
+    """Estimate the number of distinct values in column (e.g. 'salesperson').
+    
+    Relative standard error is about 1.04 / sqrt(2**precision), 0.8% by default.
+    """
+    sketch = HyperLogLog(precision=precision)
+    for chunk in _as_chunks(data, chunksize):
+        sketch.update(chunk[column])
+    return sketch.count()
+
+
+def approximate_revenue_quantiles_by_region(
+    data: SalesData,
+    quantiles: Sequence[float] = (0.5, 0.9, 0.99),
+    k: int = 200,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    seed: Optional[int] = 0,
+) -> pd.DataFrame:
+    """Approximate per-order revenue quantiles for each region.
+    
+    Uses one QuantileSketch per region; rank error is on the order of 1 / k.
+    The sketches compact at random, so a fixed seed keeps results reproducible
+    (None draws fresh randomness). Returns a DataFrame indexed by region with
+    one column per quantile.
+    """
+    sketches = {}
+    for chunk in _as_chunks(data, chunksize):
+        chunk = add_revenue_column(chunk)
+        for region, revenue in chunk.groupby("region")["revenue"]:
+            sketches.setdefault(region, QuantileSketch(k=k, seed=seed)).update(revenue)
+    return pd.DataFrame(
+        {region: sketch.quantiles(quantiles) for region, sketch in sorted(sketches.items())},
+        index=list(quantiles),
+    ).T.rename_axis("region")
+
+
 def print_analysis(df: pd.DataFrame) -> None:
     """Print results of all analyses to console."""
     df = add_revenue_column(df)
@@ -0,0 +1,167 @@
+# sa_001/sketches.py
+"""Mergeable streaming sketches for approximate sales analytics.
+
+Every sketch uses bounded memory, takes updates one chunk at a time, and
+supports merge(), so chunks can be summarised independently and combined.
+"""
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class HeavyHitters:
+    """Weighted Misra-Gries summary for top-N heavy hitters.
+
+    Misra-Gries is isomorphic to Space-Saving: it keeps at most `capacity`
+    counters. Each reported weight is a lower bound that falls short of the
+    true weight by at most `error`, with error <= total_weight / (capacity + 1).
+    Any key whose true weight exceeds that bound is guaranteed to be tracked.
+    Weights must be non-negative.
+    """
+
+    def __init__(self, capacity: int = 1000) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.counts = pd.Series(dtype="float64")
+        self.error = 0.0
+        self.total_weight = 0.0
+
+    def update(self, keys: pd.Series, weights: pd.Series) -> None:
+        """Add a chunk of (key, weight) pairs to the summary."""
+        chunk = weights.groupby(keys.values).sum()
+        self._combine(chunk, error=0.0, total_weight=float(chunk.sum()))
+
+    def merge(self, other: "HeavyHitters") -> None:
+        """Fold another summary with the same capacity into this one."""
+        if other.capacity != self.capacity:
+            raise ValueError("Cannot merge summaries with different capacities")
+        self._combine(other.counts, error=other.error, total_weight=other.total_weight)
+
+    def top(self, n: int) -> pd.Series:
+        """Return the n heaviest keys and their lower-bound weights, descending."""
+        return self.counts.sort_values(ascending=False).head(n)
+
+    def _combine(self, counts: pd.Series, error: float, total_weight: float) -> None:
+        combined = self.counts.add(counts, fill_value=0.0)
+        self.error += error
+        self.total_weight += total_weight
+        if len(combined) > self.capacity:
+            # Subtract the (capacity + 1)-th largest counter from all of them and
+            # drop the ones that reach zero; this is the Misra-Gries decrement.
+            cut = float(combined.nlargest(self.capacity + 1).iloc[-1])
+            combined = combined.sub(cut).loc[lambda s: s > 0]
+            self.error += cut
+        self.counts = combined
+
+
+class HyperLogLog:
+    """HyperLogLog distinct-count estimator with 2**precision registers.
+
+    The relative standard error is about 1.04 / sqrt(2**precision), e.g. 0.8%
+    at the default precision of 14 (16 KiB of registers).
+    """
+
+    def __init__(self, precision: int = 14) -> None:
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, values: pd.Series) -> None:
+        """Add a chunk of values to the estimator; nulls are ignored, as in nunique()."""
+        hashes = pd.util.hash_pandas_object(values.dropna(), index=False).to_numpy(dtype=np.uint64)
+        index = hashes >> np.uint64(64 - self.precision)
+        # Leading-zero count of the remaining bits, using the top 53 of them so
+        # the conversion to float64 is exact.
+        rest = (hashes << np.uint64(self.precision)) >> np.uint64(11)
+        _, bit_length = np.frexp(rest.astype(np.float64))
+        rank = (54 - bit_length).astype(np.uint8)
+        np.maximum.at(self.registers, index.astype(np.intp), rank)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """Fold another estimator with the same precision into this one."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge estimators with different precisions")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self) -> float:
+        """Return the estimated number of distinct values seen."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / float(np.sum(np.ldexp(1.0, -self.registers.astype(np.int64))))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Small-range correction: linear counting is more accurate here
+            estimate = m * np.log(m / zeros)
+        return float(estimate)
+
+
+class QuantileSketch:
+    """KLL quantile sketch over a stream of numeric values.
+
+    Keeps compactors of geometrically shrinking capacity; the normalized rank
+    error is on the order of 1 / k with high probability (around 1-2% at the
+    default k=200) and memory is O(k) regardless of stream length.
+    """
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None) -> None:
+        if k < 8:
+            raise ValueError("k must be at least 8")
+        self.k = k
+        self.rng = np.random.default_rng(seed)
+        self.compactors: List[np.ndarray] = [np.empty(0)]
+        self.count = 0
+
+    def update(self, values: Iterable[float]) -> None:
+        """Add a chunk of values to the sketch."""
+        values = np.asarray(values, dtype=np.float64)
+        self.compactors[0] = np.concatenate([self.compactors[0], values])
+        self.count += len(values)
+        self._compress()
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Fold another sketch into this one."""
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append(np.empty(0))
+        for level, items in enumerate(other.compactors):
+            self.compactors[level] = np.concatenate([self.compactors[level], items])
+        self.count += other.count
+        self._compress()
+
+    def quantiles(self, qs: Iterable[float]) -> List[float]:
+        """Return approximate values at each quantile in qs (each within [0, 1])."""
+        if self.count == 0:
+            return [float("nan") for _ in qs]
+        items = np.concatenate(self.compactors)
+        weights = np.concatenate([
+            np.full(len(level_items), 2.0 ** level)
+            for level, level_items in enumerate(self.compactors)
+        ])
+        order = np.argsort(items, kind="stable")
+        cumulative = np.cumsum(weights[order])
+        positions = np.searchsorted(cumulative, np.asarray(list(qs)) * cumulative[-1])
+        return [float(items[order][min(p, len(items) - 1)]) for p in positions]
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.compactors):
+            items = self.compactors[level]
+            if len(items) >= self._capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append(np.empty(0))
+                items = np.sort(items)
+                # Keep an odd leftover at this level; promote every other item
+                # of the rest with doubled weight, choosing the offset at random.
+                leftover = items[-1:] if len(items) % 2 else items[:0]
+                paired = items[: len(items) - len(leftover)]
+                promoted = paired[int(self.rng.integers(2))::2]
+                self.compactors[level] = leftover
+                self.compactors[level + 1] = np.concatenate([self.compactors[level + 1], promoted])
+            level += 1
+
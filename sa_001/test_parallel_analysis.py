@@ -0,0 +1,99 @@
+# sa_001/test_parallel_analysis.py
+import multiprocessing
+import threading
+
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from sa_001.sales_analysis import (
+    load_sales_data,
+    revenue_by_product,
+    revenue_by_region,
+    average_discount_by_category,
+)
+from sa_001.parallel_analysis import ParallelGroupby, synthetic_sales_data
+
+
+pytestmark = pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="ParallelGroupby requires the 'fork' start method",
+)
+
+METHODS = [
+    (revenue_by_product, "revenue_by_product"),
+    (revenue_by_region, "revenue_by_region"),
+    (average_discount_by_category, "average_discount_by_category"),
+]
+
+
+class TestParallelGroupby:
+    """Test that parallel aggregations match the serial functions."""
+
+    @pytest.mark.parametrize("serial, method", METHODS)
+    def test_matches_serial_on_sample_csv(self, serial, method):
+        """Test the sample CSV with more workers than some groups."""
+        csv_path = Path(__file__).parent / "data" / "sales_sample.csv"
+        df = load_sales_data(csv_path)
+
+        with ParallelGroupby(df, workers=3) as pool:
+            result = getattr(pool, method)()
+
+        pd.testing.assert_series_equal(result, serial(df), check_exact=True)
+
+    def test_matches_serial_on_synthetic_data(self):
+        """Test larger data with categorical and integer keys on one reused pool."""
+        df = synthetic_sales_data(50_000, products=5_000)
+
+        with ParallelGroupby(df, workers=4) as pool:
+            for serial, method in METHODS:
+                pd.testing.assert_series_equal(
+                    getattr(pool, method)(), serial(df), check_exact=True
+                )
+
+    def test_missing_values(self):
+        """Test that missing keys and discounts are skipped like groupby does."""
+        csv_path = Path(__file__).parent / "data" / "sales_sample.csv"
+        df = load_sales_data(csv_path)
+        df.loc[0, "product"] = None
+        df.loc[1, "discount"] = np.nan
+
+        with ParallelGroupby(df, workers=2) as pool:
+            pd.testing.assert_series_equal(
+                pool.revenue_by_product(), revenue_by_product(df), check_exact=True
+            )
+            pd.testing.assert_series_equal(
+                pool.average_discount_by_category(),
+                average_discount_by_category(df),
+                check_exact=True,
+            )
+
+    def test_more_workers_than_rows(self):
+        """Test that empty shards are handled."""
+        df = load_sales_data(Path(__file__).parent / "data" / "sales_sample.csv").head(3)
+
+        with ParallelGroupby(df, workers=5) as pool:
+            pd.testing.assert_series_equal(
+                pool.revenue_by_region(), revenue_by_region(df), check_exact=True
+            )
+
+    def test_invalid_worker_count(self):
+        """Test that a non-positive worker count is rejected."""
+        with pytest.raises(ValueError):
+            ParallelGroupby(synthetic_sales_data(10), workers=0)
+
+    def test_refuses_to_fork_with_other_threads(self):
+        """Test that creation fails clearly while other threads are running."""
+        stop = threading.Event()
+        thread = threading.Thread(target=stop.wait)
+        thread.start()
+        try:
+            with pytest.raises(RuntimeError):
+                ParallelGroupby(synthetic_sales_data(10), workers=1)
+        finally:
+            stop.set()
+            thread.join()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
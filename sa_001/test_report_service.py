@@ -0,0 +1,235 @@
+# sa_001/test_report_service.py
+import os
+import time
+from threading import Barrier, Thread
+from pathlib import Path
+
+import pytest
+import pandas as pd
+
+from sa_001 import report_service
+from sa_001.report_service import (
+    TTLCache,
+    SingleFlight,
+    SalesReportService,
+    ReportClient,
+)
+from sa_001.sales_analysis import load_sales_data, top_n_products_by_revenue
+
+
+SAMPLE_CSV = Path(__file__).parent / "data" / "sales_sample.csv"
+
+
+class FakeClock:
+    """Manually advanced clock for TTL tests."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache:
+    """Test cases for TTLCache."""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the least recently used entry is evicted when full."""
+        cache = TTLCache(max_entries=2, ttl=None)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")  # "b" is now least recently used
+        cache.put("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_entries_expire_after_ttl(self):
+        """Test that entries are dropped once their TTL has elapsed."""
+        clock = FakeClock()
+        cache = TTLCache(ttl=10.0, clock=clock)
+        cache.put("a", 1)
+
+        clock.now = 9.0
+        assert cache.get("a") == 1
+        clock.now = 10.0
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+
+class TestSingleFlight:
+    """Test cases for SingleFlight."""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Test that identical concurrent calls run the function once."""
+        flight = SingleFlight()
+        calls = []
+        results = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.1)
+            return 42
+
+        threads = [Thread(target=lambda: results.append(flight.do("key", slow))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=2)
+
+        assert len(calls) == 1
+        assert results == [42] * 5
+
+    def test_error_propagates_to_waiters(self):
+        """Test that an exception is raised in the caller and not remembered."""
+        flight = SingleFlight()
+
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            flight.do("key", fail)
+        assert flight.do("key", lambda: "ok") == "ok"
+
+
+class TestSalesReportService:
+    """Test cases for SalesReportService."""
+
+    def test_report_matches_direct_call(self):
+        """Test that served metrics equal the underlying analysis functions."""
+        with SalesReportService() as service:
+            result = service.report(SAMPLE_CSV, "top_n_products_by_revenue", n=3)
+
+        expected = top_n_products_by_revenue(load_sales_data(SAMPLE_CSV), n=3)
+        pd.testing.assert_series_equal(result, expected)
+
+    def test_params_are_part_of_cache_key(self):
+        """Test that different parameters produce separately cached results."""
+        with SalesReportService() as service:
+            top_2 = service.report(SAMPLE_CSV, "top_n_products_by_revenue", n=2)
+            top_3 = service.report(SAMPLE_CSV, "top_n_products_by_revenue", n=3)
+
+        assert len(top_2) == 2
+        assert len(top_3) == 3
+
+    def test_miss_counted_once(self):
+        """Test that a cache miss is recorded once and a repeat is a hit."""
+        with SalesReportService() as service:
+            service.report(SAMPLE_CSV, "total_revenue")
+            service.report(SAMPLE_CSV, "total_revenue")
+
+        assert service.results.misses == 1
+        assert service.results.hits == 1
+
+    def test_concurrent_requests_load_once(self, monkeypatch):
+        """Test that simultaneous identical requests share one load and computation."""
+        loads = []
+
+        def counting_load(csv_path):
+            loads.append(csv_path)
+            time.sleep(0.1)
+            return load_sales_data(csv_path)
+
+        monkeypatch.setattr(report_service, "load_sales_data", counting_load)
+        barrier = Barrier(8)
+        results = []
+
+        def request():
+            barrier.wait()
+            results.append(service.report(SAMPLE_CSV, "total_revenue"))
+
+        with SalesReportService() as service:
+            threads = [Thread(target=request) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(timeout=2)
+            # A second round is served from the cache
+            service.report(SAMPLE_CSV, "total_revenue")
+
+        assert len(loads) == 1
+        assert len(results) == 8
+        assert len(set(results)) == 1
+
+    def test_file_change_invalidates_cache(self, tmp_path):
+        """Test that modifying the CSV produces fresh results."""
+        csv_path = tmp_path / "sales.csv"
+        lines = SAMPLE_CSV.read_text().splitlines()
+        csv_path.write_text("\n".join(lines[:2]) + "\n")
+
+        with SalesReportService() as service:
+            before = service.report(csv_path, "total_revenue")
+            csv_path.write_text("\n".join(lines[:3]) + "\n")
+            # Ensure the mtime differs even on coarse-grained filesystems
+            stat = csv_path.stat()
+            os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            after = service.report(csv_path, "total_revenue")
+
+        assert after > before
+
+    def test_approximate_top_n_is_streamed(self, monkeypatch):
+        """Test that approximate=True reads CSV chunks instead of loading the file."""
+        def fail_load(csv_path):
+            raise AssertionError("approximate requests must not load the whole file")
+
+        monkeypatch.setattr(report_service, "load_sales_data", fail_load)
+        with SalesReportService() as service:
+            result = service.report(SAMPLE_CSV, "top_n_products_by_revenue", n=3, approximate=True)
+
+        expected = top_n_products_by_revenue(load_sales_data(SAMPLE_CSV), n=3)
+        pd.testing.assert_series_equal(result, expected)
+
+    def test_reports_runs_multiple_metrics(self):
+        """Test computing several metrics in one call on the worker pool."""
+        with SalesReportService(max_workers=3) as service:
+            results = service.reports(
+                SAMPLE_CSV, ["total_revenue", "revenue_by_region", "average_discount_by_category"]
+            )
+
+        assert results["total_revenue"] == pytest.approx(15704.94, abs=0.01)
+        assert isinstance(results["revenue_by_region"], pd.Series)
+        assert isinstance(results["average_discount_by_category"], pd.Series)
+
+
+class TestReportClient:
+    """Test cases for the in-process ReportClient."""
+
+    def test_successful_request(self):
+        """Test that a valid request returns an ok response."""
+        with SalesReportService() as service:
+            client = ReportClient(service)
+            response = client.request({"path": str(SAMPLE_CSV), "metric": "total_revenue"})
+
+        assert response["status"] == "ok"
+        assert response["result"] == pytest.approx(15704.94, abs=0.01)
+
+    def test_json_list_params(self):
+        """Test that list parameters from JSON are accepted and cached."""
+        with SalesReportService() as service:
+            client = ReportClient(service)
+            payload = {
+                "path": str(SAMPLE_CSV),
+                "metric": "approximate_revenue_quantiles_by_region",
+                "params": {"quantiles": [0.5, 0.9]},
+            }
+            first = client.request(payload)
+            second = client.request(payload)
+
+        assert first["status"] == "ok"
+        assert list(first["result"].columns) == [0.5, 0.9]
+        assert second["result"] is first["result"]
+        assert service.results.hits == 1
+
+    def test_unknown_metric_returns_error(self):
+        """Test that invalid requests are reported rather than raised."""
+        with SalesReportService() as service:
+            client = ReportClient(service)
+            response = client.request({"path": str(SAMPLE_CSV), "metric": "nope"})
+
+        assert response["status"] == "error"
+        assert "nope" in response["error"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -11,6 +11,10 @@ from sa_001.sales_analysis import (
     average_discount_by_category,
     top_n_products_by_revenue,
     load_sales_data,
+    iter_sales_chunks,
+    approximate_top_n_products_by_revenue,
+    approximate_distinct_count,
+    approximate_revenue_quantiles_by_region,
 )
 
 
@@ -215,6 +219,57 @@ class TestLoadSalesData:
         assert isinstance(first_date, pd.Timestamp)
 
 
+class TestApproximateAnalysis:
+    """Test cases for the sketch-based approximate functions."""
+
+    def test_top_n_matches_exact_on_small_data(self):
+        """Test that approximate top N equals the exact result under capacity."""
+        df = _sample_df()
+        exact = top_n_products_by_revenue(df, n=2)
+        
+        pd.testing.assert_series_equal(
+            top_n_products_by_revenue(df, n=2, approximate=True), exact
+        )
+
+    def test_streamed_chunks(self):
+        """Test approximate functions over CSV chunks."""
+        csv_path = Path(__file__).parent / "data" / "sales_sample.csv"
+        df = load_sales_data(csv_path)
+        
+        top = approximate_top_n_products_by_revenue(iter_sales_chunks(csv_path, chunksize=4), n=3)
+        assert top.tolist() == pytest.approx(top_n_products_by_revenue(df, n=3).tolist())
+        
+        distinct = approximate_distinct_count(iter_sales_chunks(csv_path, chunksize=4), "product")
+        assert distinct == pytest.approx(df["product"].nunique(), abs=1)
+
+    def test_dataframe_input_is_chunked(self):
+        """Test that a DataFrame is processed in bounded row chunks."""
+        df = _sample_df()
+        chunked = approximate_top_n_products_by_revenue(df, n=3, chunksize=1)
+        
+        pd.testing.assert_series_equal(chunked, top_n_products_by_revenue(df, n=3))
+        assert approximate_distinct_count(df, "product", chunksize=1) == pytest.approx(3, abs=0.5)
+
+    def test_revenue_quantiles_by_region(self):
+        """Test per-region quantiles on data small enough to be exact."""
+        df = _sample_df()
+        result = approximate_revenue_quantiles_by_region(df, quantiles=(0.0, 1.0))
+        
+        # North orders: 90.0 and 60.0
+        assert result.loc["North", 0.0] == pytest.approx(60.0)
+        assert result.loc["North", 1.0] == pytest.approx(90.0)
+        assert sorted(result.index) == ["East", "North", "South"]
+
+    def test_quantiles_are_reproducible(self):
+        """Test that repeated calls with the same seed agree on larger data."""
+        rows = pd.concat([_sample_df()] * 500, ignore_index=True)
+        rows["quantity"] = range(len(rows))
+        
+        first = approximate_revenue_quantiles_by_region(rows, k=16, chunksize=100)
+        second = approximate_revenue_quantiles_by_region(rows, k=16, chunksize=100)
+        pd.testing.assert_frame_equal(first, second)
+
+
 class TestFunctionalProgrammingPatterns:
     """Test that functional programming patterns are used correctly."""
 
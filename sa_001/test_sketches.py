@@ -0,0 +1,126 @@
+# sa_001/test_sketches.py
+import pytest
+import numpy as np
+import pandas as pd
+from sa_001.sketches import HeavyHitters, HyperLogLog, QuantileSketch
+
+
+def _skewed_stream(size=50_000, seed=0):
+    """Create Zipf-distributed keys with random positive weights."""
+    rng = np.random.default_rng(seed)
+    keys = pd.Series(rng.zipf(1.5, size) % 5_000).astype(str)
+    weights = pd.Series(rng.uniform(1.0, 10.0, size))
+    return keys, weights
+
+
+class TestHeavyHitters:
+    """Test cases for HeavyHitters summary."""
+
+    def test_exact_when_under_capacity(self):
+        """Test that weights are exact while few keys are tracked."""
+        sketch = HeavyHitters(capacity=10)
+        sketch.update(pd.Series(["a", "b", "a"]), pd.Series([1.0, 2.0, 3.0]))
+
+        assert sketch.top(2).to_dict() == {"a": 4.0, "b": 2.0}
+        assert sketch.error == 0.0
+
+    def test_error_bound_and_top_keys(self):
+        """Test that estimates stay within the documented error bound."""
+        keys, weights = _skewed_stream()
+        exact = weights.groupby(keys.values).sum().sort_values(ascending=False)
+
+        sketch = HeavyHitters(capacity=100)
+        for start in range(0, len(keys), 5_000):
+            sketch.update(keys[start:start + 5_000], weights[start:start + 5_000])
+
+        assert len(sketch.counts) <= 100
+        assert sketch.error <= sketch.total_weight / 101
+        top = sketch.top(5)
+        assert top.index.tolist() == exact.index[:5].tolist()
+        for key, estimate in top.items():
+            assert exact[key] - sketch.error - 1e-6 <= estimate <= exact[key] + 1e-6
+
+    def test_merge_matches_bounds(self):
+        """Test that merged summaries keep the bound over the combined stream."""
+        keys, weights = _skewed_stream()
+        exact = weights.groupby(keys.values).sum()
+        half = len(keys) // 2
+
+        left, right = HeavyHitters(capacity=50), HeavyHitters(capacity=50)
+        left.update(keys[:half], weights[:half])
+        right.update(keys[half:], weights[half:])
+        left.merge(right)
+
+        assert left.total_weight == pytest.approx(weights.sum())
+        assert left.error <= left.total_weight / 51
+        for key, estimate in left.counts.items():
+            assert exact[key] - left.error - 1e-6 <= estimate <= exact[key] + 1e-6
+
+
+class TestHyperLogLog:
+    """Test cases for HyperLogLog estimator."""
+
+    @pytest.mark.parametrize("distinct", [100, 200_000])
+    def test_estimate_within_error(self, distinct):
+        """Test estimates in both the small and large range."""
+        values = pd.Series(np.arange(distinct)).astype(str)
+        sketch = HyperLogLog(precision=14)
+        sketch.update(values)
+        sketch.update(values)  # duplicates must not count
+
+        assert sketch.count() == pytest.approx(distinct, rel=0.05)
+
+    def test_nulls_are_ignored(self):
+        """Test that nulls are not counted, matching nunique()."""
+        sketch = HyperLogLog()
+        sketch.update(pd.Series([None, None, np.nan]))
+        assert sketch.count() == 0.0
+
+        sketch.update(pd.Series(["a", None, "b"]))
+        assert sketch.count() == pytest.approx(2, abs=0.5)
+
+    def test_merge_equals_union(self):
+        """Test that merging estimators counts the union of their inputs."""
+        left, right = HyperLogLog(), HyperLogLog()
+        left.update(pd.Series(range(0, 60_000)))
+        right.update(pd.Series(range(40_000, 100_000)))
+        left.merge(right)
+
+        assert left.count() == pytest.approx(100_000, rel=0.05)
+
+
+class TestQuantileSketch:
+    """Test cases for QuantileSketch."""
+
+    def test_rank_error_is_bounded(self):
+        """Test that quantile estimates have small normalized rank error."""
+        rng = np.random.default_rng(1)
+        values = rng.exponential(100.0, 200_000)
+        sketch = QuantileSketch(k=200, seed=1)
+        for chunk in np.array_split(values, 20):
+            sketch.update(chunk)
+
+        ordered = np.sort(values)
+        for q, estimate in zip([0.1, 0.5, 0.9, 0.99], sketch.quantiles([0.1, 0.5, 0.9, 0.99])):
+            rank = np.searchsorted(ordered, estimate) / len(values)
+            assert abs(rank - q) < 0.02
+        # Memory stays bounded regardless of stream length
+        assert sum(len(items) for items in sketch.compactors) < 1_000
+
+    def test_merge(self):
+        """Test that merging two sketches approximates the combined stream."""
+        left, right = QuantileSketch(seed=2), QuantileSketch(seed=3)
+        left.update(np.arange(0, 50_000, dtype=float))
+        right.update(np.arange(50_000, 100_000, dtype=float))
+        left.merge(right)
+
+        assert left.count == 100_000
+        assert left.quantiles([0.5])[0] == pytest.approx(50_000, abs=2_000)
+
+    def test_empty_sketch(self):
+        """Test that an empty sketch returns NaN quantiles."""
+        assert np.isnan(QuantileSketch().quantiles([0.5])[0])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])